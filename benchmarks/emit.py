@@ -0,0 +1,71 @@
+"""
+Benchmark of building a model, converting it to commands and writing it to .scad file.
+
+Run from the root of a checkout: python benchmarks/emit.py
+Prints the best time of every stage over several runs, so checkouts can be compared on the same machine.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from scad.core import ScadObject
+from scad.operators import Hull, IDUObject
+from scad.primitives import box, cylinder, sphere
+
+PARTS = 3000
+RUNS = 15
+
+
+def build_plain() -> ScadObject:
+    """
+    A model of many parts without transformations.
+    """
+    model = IDUObject()
+    for i in range(PARTS):
+        part = IDUObject([box(i, 2, 3), sphere(i, fn=16)], [cylinder(i, 1, 2)])
+        model += Hull([part, box(1, 1, i)]).colored("red").named(f"part{i}")
+    return model
+
+
+def build_transformed() -> ScadObject:
+    """
+    A model of many parts, each placed with a chain of transformations.
+    """
+    model = IDUObject()
+    for i in range(PARTS):
+        part = box(1, 2, 3).rotated((0, 0, i)).translated((i, 0.5, 0)).scaled((1, 1, 2))
+        model += part.named(f"part{i}")
+    return model
+
+
+def measure(build) -> None:
+    """
+    Print the best time of building, converting and writing the model.
+    """
+    best = {"build": float("inf"), "to_command": float("inf"), "write_to": float("inf")}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "model.scad"
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            model = build()
+            built = time.perf_counter()
+            command = model.to_command()
+            converted = time.perf_counter()
+            command.write_to(path)
+            written = time.perf_counter()
+            best["build"] = min(best["build"], built - start)
+            best["to_command"] = min(best["to_command"], converted - built)
+            best["write_to"] = min(best["write_to"], written - converted)
+    total = sum(best.values())
+    stages = ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in best.items())
+    print(f"{build.__name__}: {stages}, total {total * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    measure(build_plain)
+    measure(build_transformed)
@@ -33,4 +33,4 @@ def test() -> ScadObject:
     )
 
 
-test().to_command().write_to(Path("test.scad"))
+test().write_to(Path("test.scad"))
@@ -0,0 +1,179 @@
+"""
+The module provides conversion of Python values to OpenSCAD representation.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy
+
+
+def format_bool(value: bool) -> str:
+    """
+    Convert boolean to OpenSCAD representation.
+    """
+    return "true" if value else "false"
+
+
+def format_string(value: str) -> str:
+    """
+    Convert string to OpenSCAD representation.
+    """
+    # TODO: Excape string.
+    return f'"{value}"'
+
+
+# Number of significant digits of floats written to .scad file, None writes floats exactly.
+# Floats are written exactly by default, use set_float_precision() to round them.
+SCAD_FLOAT_PRECISION: Optional[int] = None
+
+# Incremented whenever formatting of values changes, caches of formatted text are valid only for the same generation.
+format_generation = 0  # pylint: disable=invalid-name
+
+
+def _float_formats(precision: Optional[int]) -> Tuple[Callable[..., str], Callable[..., str], Callable[..., str], str]:
+    """
+    Formatters of a float, a vector of 3 and 4 floats and a %-conversion of a float with the given precision.
+    """
+    item = "{!r}" if precision is None else f"{{:.{precision}g}}"
+    conversion = "%r" if precision is None else f"%.{precision}g"
+    # float.__repr__ also writes subclasses of float, e.g. numpy.float64, as plain numbers.
+    format_item = float.__repr__ if precision is None else item.format
+    return format_item, f"[{item}, {item}, {item}]".format, f"[{item}, {item}, {item}, {item}]".format, conversion
+
+
+format_float, format_float_vector3, format_float_vector4, float_conversion = _float_formats(SCAD_FLOAT_PRECISION)
+
+sequence_types = frozenset({list, tuple})
+
+
+# Whether floats and ints are formatted by the built-in formatters, which the fast paths below inline.
+# Formatters registered for float or int disable the fast paths, the flag is updated by register_formatter().
+_default_number_formats = True  # pylint: disable=invalid-name
+
+
+def format_sequence(value: Sequence[Any]) -> str:
+    """
+    Convert list or tuple to OpenSCAD vector.
+    """
+    # pylint: disable=unidiomatic-typecheck,too-many-return-statements
+    if _default_number_formats:
+        # Exact types are checked: bools are ints and must not be written as numbers.
+        # Vectors of 3 or 4 plain numbers are the most common arguments, they are formatted in one step.
+        if len(value) == 3:
+            x, y, z = value
+            if type(x) is float and type(y) is float and type(z) is float:
+                return format_float_vector3(x, y, z)
+            if type(x) is int and type(y) is int and type(z) is int:
+                return f"[{x!r}, {y!r}, {z!r}]"
+        elif len(value) == 4:
+            x, y, z, w = value
+            if type(x) is float and type(y) is float and type(z) is float and type(w) is float:
+                return format_float_vector4(x, y, z, w)
+            if type(x) is int and type(y) is int and type(z) is int and type(w) is int:
+                return f"[{x!r}, {y!r}, {z!r}, {w!r}]"
+        # Long vectors of numbers (e.g. polyhedron points and faces) skip the per-item dispatch.
+        if all(type(item) is float for item in value):
+            return f"[{', '.join(map(format_float, value))}]"
+        if all(type(item) is int for item in value):
+            return f"[{', '.join(map(repr, value))}]"
+    if all(type(item) in sequence_types for item in value):
+        return f"[{', '.join(map(format_sequence, value))}]"
+    return f"[{', '.join(format_value(item) for item in value)}]"
+
+
+def format_array(value: numpy.ndarray | numpy.generic) -> str:
+    """
+    Convert numpy array or scalar to OpenSCAD representation.
+    """
+    if value.ndim == 2 and value.dtype.kind in "iuf" and _default_number_formats:
+        # Matrices of numbers, e.g. polyhedron points and faces, are formatted with one %-operation.
+        rows, columns = value.shape
+        conversion = float_conversion if value.dtype.kind == "f" else "%d"
+        row_format = f"[{', '.join((conversion,) * columns)}]"
+        return f"[{', '.join((row_format,) * rows)}]" % tuple(value.ravel().tolist())
+    # tolist() converts the whole array to Python numbers in C.
+    return format_value(value.tolist())
+
+
+# Use register_formatter() to change the table, so that caches of formatted text and fast paths are updated.
+value_formatters: Dict[type, Callable[[Any], str]] = {
+    bool: format_bool,
+    int: int.__repr__,
+    float: format_float,
+    str: format_string,
+    list: format_sequence,
+    tuple: format_sequence,
+    numpy.ndarray: format_array,
+    numpy.generic: format_array,
+}
+
+
+def register_formatter(value_type: type, formatter: Callable[[Any], str]) -> None:
+    """
+    Register conversion of values of the type to OpenSCAD representation.
+    Values of exactly the registered type are dispatched to the formatter with one lookup.
+    """
+    global format_generation, _default_number_formats  # pylint: disable=global-statement,invalid-name
+    format_generation += 1
+    value_formatters[value_type] = formatter
+    _default_number_formats = value_formatters.get(float) is format_float and value_formatters.get(int) is int.__repr__
+
+
+def set_float_precision(precision: Optional[int]) -> None:
+    """
+    Set the number of significant digits of floats written to .scad file, None writes floats exactly.
+    Already created objects are written with the new precision too.
+    """
+    # pylint: disable=global-statement
+    global SCAD_FLOAT_PRECISION, format_float, format_float_vector3, format_float_vector4, float_conversion
+    global format_generation, _default_number_formats  # pylint: disable=invalid-name
+    format_generation += 1
+    SCAD_FLOAT_PRECISION = precision
+    format_float, format_float_vector3, format_float_vector4, float_conversion = _float_formats(precision)
+    value_formatters[float] = format_float
+    _default_number_formats = value_formatters.get(int) is int.__repr__
+
+
+def format_value(value: Any) -> str:
+    """
+    Convert Python object to OpenSCAD representation.
+    """
+    formatter = value_formatters.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+
+    # Subclasses of supported types, e.g. numpy.float64.
+    for base, formatter in value_formatters.items():
+        if isinstance(value, base):
+            return formatter(value)
+
+    raise ValueError("Unsupported type")
+
+
+def format_argument(name: str, value: Any) -> str:
+    """
+    Format named argument.
+    """
+    return f"{name}={format_value(value)}"
+
+
+def format_command_arguments(arguments: Dict[str, Any]) -> str:
+    """
+    Format command arguments.
+    """
+    # Same as joining format_argument() results; values of exactly registered types skip format_value().
+    formatters = value_formatters
+    return ", ".join(
+        [
+            f"{name}={(formatters.get(type(value)) or format_value)(value)}"
+            for name, value in arguments.items()
+            if value is not None
+        ]
+    )
+
+
+def indent(indentation: int, line: str) -> str:
+    """
+    Add indentation to the line.
+    """
+    return " " * indentation + line
@@ -0,0 +1,111 @@
+"""
+The module provides arithmetic kernels for building transformation matrices.
+Kernels are compiled with numba when it is installed and run as plain Python otherwise.
+Every kernel returns a new 4x4 float64 array.
+"""
+
+from math import cos, pi, sin
+from typing import Tuple
+
+import numpy
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+Rows = Tuple[Tuple[float, float, float, float], ...]
+
+
+def _rot_xyz_rows(x_deg: float, y_deg: float, z_deg: float) -> Rows:
+    """
+    Rows of the transformation matrix of rotation around X, then Y, then Z, i.e. Rz @ Ry @ Rx.
+    """
+    sin_x, cos_x = sin(x_deg * pi / 180), cos(x_deg * pi / 180)
+    sin_y, cos_y = sin(y_deg * pi / 180), cos(y_deg * pi / 180)
+    sin_z, cos_z = sin(z_deg * pi / 180), cos(z_deg * pi / 180)
+    return (
+        (cos_z * cos_y, cos_z * sin_y * sin_x - sin_z * cos_x, cos_z * sin_y * cos_x + sin_z * sin_x, 0.0),
+        (sin_z * cos_y, sin_z * sin_y * sin_x + cos_z * cos_x, sin_z * sin_y * cos_x - cos_z * sin_x, 0.0),
+        (-sin_y, cos_y * sin_x, cos_y * cos_x, 0.0),
+        (0.0, 0.0, 0.0, 1.0),
+    )
+
+
+def _reflect_rows(a: float, b: float, c: float) -> Rows:  # pylint: disable=invalid-name
+    """
+    Rows of the transformation matrix of reflection in the plane with normal (a, b, c) passing through the origin.
+    """
+    # From: https://en.wikipedia.org/wiki/Transformation_matrix#Reflection_2
+    # Float literals keep all items floats for integer normals too, numba needs rows of one type.
+    # Products are subtracted from zero, so that zero items are never written as -0.
+    return (
+        (1.0 - 2.0 * a * a, 0.0 - 2.0 * b * a, 0.0 - 2.0 * c * a, 0.0),
+        (0.0 - 2.0 * a * b, 1.0 - 2.0 * b * b, 0.0 - 2.0 * c * b, 0.0),
+        (0.0 - 2.0 * a * c, 0.0 - 2.0 * b * c, 1.0 - 2.0 * c * c, 0.0),
+        (0.0, 0.0, 0.0, 1.0),
+    )
+
+
+if njit is None:
+
+    def rot_xyz(x_deg: float, y_deg: float, z_deg: float) -> numpy.ndarray:
+        """
+        Transformation matrix of rotation around X, then Y, then Z, i.e. Rz @ Ry @ Rx.
+        """
+        return numpy.array(_rot_xyz_rows(x_deg, y_deg, z_deg))
+
+    def reflect(a: float, b: float, c: float) -> numpy.ndarray:  # pylint: disable=invalid-name
+        """
+        Transformation matrix of reflection in the plane with normal (a, b, c) passing through the origin.
+        """
+        return numpy.array(_reflect_rows(a, b, c))
+
+    def mm4(a: numpy.ndarray, b: numpy.ndarray) -> numpy.ndarray:  # pylint: disable=invalid-name
+        """
+        Product of two 4x4 matrices.
+        """
+        return numpy.matmul(a, b)
+
+else:
+    _rot_xyz_rows = njit(cache=True)(_rot_xyz_rows)
+    _reflect_rows = njit(cache=True)(_reflect_rows)
+
+    @njit(cache=True)
+    def _from_rows(rows: Rows) -> numpy.ndarray:
+        """
+        4x4 matrix with the given rows.
+        """
+        out = numpy.empty((4, 4))
+        for i in range(4):
+            for j in range(4):
+                out[i, j] = rows[i][j]
+        return out
+
+    @njit(cache=True)
+    def rot_xyz(x_deg: float, y_deg: float, z_deg: float) -> numpy.ndarray:
+        """
+        Transformation matrix of rotation around X, then Y, then Z, i.e. Rz @ Ry @ Rx.
+        """
+        return _from_rows(_rot_xyz_rows(x_deg, y_deg, z_deg))
+
+    @njit(cache=True)
+    def reflect(a: float, b: float, c: float) -> numpy.ndarray:  # pylint: disable=invalid-name
+        """
+        Transformation matrix of reflection in the plane with normal (a, b, c) passing through the origin.
+        """
+        return _from_rows(_reflect_rows(a, b, c))
+
+    @njit(cache=True)
+    def mm4(a: numpy.ndarray, b: numpy.ndarray) -> numpy.ndarray:  # pylint: disable=invalid-name
+        """
+        Product of two 4x4 matrices.
+        """
+        out = numpy.empty((4, 4))
+        for i in range(4):
+            for j in range(4):
+                value = 0.0
+                for k in range(4):
+                    value += a[i, k] * b[k, j]
+                out[i, j] = value
+        return out
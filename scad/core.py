@@ -2,58 +2,382 @@
 The module provides an interface for creating OpenSCAD objects.
 """
 
+import functools
+import numbers
+import sys
 import textwrap
-from abc import ABC, abstractmethod
+import weakref
 from math import pi
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
+import numpy
 from pytransform3d import rotations, transformations
 
-from scad.scad import Command, Commented, Module
+from scad import _fmt
+from scad._math_kernels import mm4, reflect, rot_xyz
+from scad.scad import Command, Commented, Module, format_command_arguments
 
 Vector3 = Tuple[float, float, float]
 Vector4 = Tuple[float, float, float, float]
 
 TransformationMatrix = Tuple[Vector4, Vector4, Vector4, Vector4]
 
+_COLOR = sys.intern("color")
+_RENDER = sys.intern("render")
+_BACKGROUND = sys.intern("%")
+_DEBUG = sys.intern("#")
+_ROOT = sys.intern("|")
+_DISABLE = sys.intern("*")
 
-class ScadObject(ABC):
+# Deeper subtrees are converted to commands iteratively, so that long chains do not hit the recursion limit.
+_MAX_RECURSION_DEPTH = 200
+
+
+def _add_vectors(a: Vector3, b: Vector3) -> Vector3:  # pylint: disable=invalid-name
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _multiply_vectors(a: Vector3, b: Vector3) -> Vector3:  # pylint: disable=invalid-name
+    return (a[0] * b[0], a[1] * b[1], a[2] * b[2])
+
+
+def _matrix_from_euler_angles(x_deg: float, y_deg: float, z_deg: float) -> numpy.ndarray:
+    """
+    Transformation matrix of rotation around X, then Y, then Z, i.e. Rz @ Ry @ Rx.
+    """
+    return rot_xyz(x_deg, y_deg, z_deg)
+
+
+def _rotation_matrix(angle_deg: Vector3 | float, axis: Vector3 = None) -> numpy.ndarray:
+    """
+    Read-only transformation matrix of rotation.
+    Matrices are shared by all rotations with the same angles and axis.
+    """
+    # Vectors are converted to tuples, so that lists can be used as keys of the cache.
+    if not isinstance(angle_deg, (int, float, numbers.Real)):
+        x_deg, y_deg, z_deg = angle_deg
+        angle_deg = (x_deg, y_deg, z_deg)
+    return _cached_rotation_matrix(angle_deg, None if axis is None else tuple(axis))
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_rotation_matrix(angle_deg: Vector3 | float, axis: Optional[Vector3]) -> numpy.ndarray:
+    matrix = _compute_rotation_matrix(angle_deg, axis)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _compute_rotation_matrix(angle_deg: Vector3 | float, axis: Optional[Vector3]) -> numpy.ndarray:
+    if axis is not None:
+        if isinstance(angle_deg, tuple):
+            raise ValueError("When angle_deg specified as a vector, axis must be None")
+        rotation_matrix = rotations.matrix_from_axis_angle(axis + (angle_deg * pi / 180,))
+        return transformations.transform_from(rotation_matrix, (0, 0, 0))
+    if isinstance(angle_deg, tuple):
+        return _matrix_from_euler_angles(*angle_deg)
+    # Like OpenSCAD, a single angle without an axis rotates around Z.
+    return _matrix_from_euler_angles(0, 0, angle_deg)
+
+
+def _scaling_matrix(vector: Vector3) -> numpy.ndarray:
+    x, y, z = vector
+    return numpy.array(((x, 0.0, 0.0, 0.0), (0.0, y, 0.0, 0.0), (0.0, 0.0, z, 0.0), (0.0, 0.0, 0.0, 1.0)))
+
+
+def _translation_matrix(vector: Vector3) -> numpy.ndarray:
+    x, y, z = vector
+    return numpy.array(((1.0, 0.0, 0.0, x), (0.0, 1.0, 0.0, y), (0.0, 0.0, 1.0, z), (0.0, 0.0, 0.0, 1.0)))
+
+
+def _reflection_matrix(vector: Vector3) -> numpy.ndarray:
+    return reflect(vector[0], vector[1], vector[2])
+
+
+def _affine_matrix(matrix: numpy.ndarray) -> Optional[numpy.ndarray]:
+    """
+    4x4 form of the transformation matrix, None if the matrix is neither 4x4 nor 3x4.
+    """
+    if matrix.shape == (4, 4):
+        return matrix
+    if matrix.shape == (3, 4):
+        # OpenSCAD accepts multmatrix without the last row, it is implied.
+        return numpy.vstack((matrix, (0.0, 0.0, 0.0, 1.0)))
+    return None
+
+
+def euler_rotation_matrices(angles_deg: numpy.ndarray) -> numpy.ndarray:
+    """
+    Transformation matrices of rotations given as an (N, 3) array of angles in degrees.
+    Rotations are applied in the same order as by rotated(): around X, then Y, then Z.
+    Public API for building many rotations at once, e.g. to pass them to transformed().
+    """
+    angles = numpy.radians(numpy.asarray(angles_deg, dtype=numpy.float64))
+    sin_x, sin_y, sin_z = numpy.sin(angles).T
+    cos_x, cos_y, cos_z = numpy.cos(angles).T
+    matrices = numpy.zeros((len(angles), 4, 4))
+    matrices[:, 0, 0] = cos_z * cos_y
+    matrices[:, 0, 1] = cos_z * sin_y * sin_x - sin_z * cos_x
+    matrices[:, 0, 2] = cos_z * sin_y * cos_x + sin_z * sin_x
+    matrices[:, 1, 0] = sin_z * cos_y
+    matrices[:, 1, 1] = sin_z * sin_y * sin_x + cos_z * cos_x
+    matrices[:, 1, 2] = sin_z * sin_y * cos_x - cos_z * sin_x
+    matrices[:, 2, 0] = -sin_y
+    matrices[:, 2, 1] = cos_y * sin_x
+    matrices[:, 2, 2] = cos_y * cos_x
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def freeze_names(*names: str) -> FrozenSet[str]:
+    """
+    Set of names that can be passed as hidden_names many times without being converted again.
+    """
+    return frozenset(names)
+
+
+def _formatted_arguments(cached: Optional[Tuple[int, str]], arguments: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Formatted arguments stamped with the format generation, the cached text is reused if it is still valid.
+    """
+    if cached is not None and cached[0] == _fmt.format_generation:
+        return cached
+    return (_fmt.format_generation, format_command_arguments(arguments))
+
+
+@functools.lru_cache(maxsize=512)
+def _dedent_comment(comment: str) -> str:
+    return textwrap.dedent(comment).strip("\n")
+
+
+class ScadObject:
     """
     Base class for all SCAD objects.
     """
 
+    __slots__ = (
+        "_command_cache",
+        "_command_generation",
+        "_name_index",
+        "_lookup_cache",
+        "_changeable",
+        "_parents",
+        "__weakref__",
+    )
+
+    # Whether objects of the class can be modified after construction.
+    _mutable = False
+
+    # __getitem__ looks up descendants by name, it must not make objects iterable through the legacy protocol.
+    __iter__ = None
+
+    def __init__(self) -> None:
+        # The cached command is stamped with the format generation it was formatted in.
+        # Caches are dropped when the object or any of its descendants is modified.
+        self._command_cache: Optional[Module] = None
+        self._command_generation = -1
+        self._name_index: Optional[Dict[str, List[NamedWrapper]]] = None
+        self._lookup_cache: Optional[Dict[Tuple[str, ...], ScadObject]] = None
+        # Whether the object or any of its descendants can be modified, set by _attach().
+        self._changeable = self._mutable
+        # Weak references to the parents by their ids, only for changeable objects.
+        self._parents: Optional[Dict[int, weakref.ref]] = None
+
+    def _attach(self, child: "ScadObject") -> None:
+        """
+        Register the object as a parent of the child, so that modifications of the child invalidate its caches.
+        Children that can never be modified are not registered.
+        """
+        # pylint: disable=protected-access
+        if child._changeable:
+            self._changeable = True
+            if child._parents is None:
+                child._parents = {}
+            child._parents[id(self)] = weakref.ref(self)
+
     def search(self, name_parts: Tuple[str, ...]) -> List["ScadObject"]:
         """
-        Recursively search for all descendants with the given name.
+        Search for all descendants with the given name.
         """
-        result = []
-        for child in self.iter_children():
-            result.extend(child.search(name_parts))
+        result: List[ScadObject] = []
+        self._search_into(name_parts, result)
         return result
 
-    def __item__(self, name: str | Tuple[str, ...]) -> "ScadObject":
-        name_parts = (name,) if isinstance(name, str) else name
+    def _search_into(self, name_parts: Tuple[str, ...], result: List["ScadObject"]) -> None:
+        """
+        Append all descendants with the given name to the result.
+        """
+        # pylint: disable=protected-access
+        candidates = self._get_name_index().get(name_parts[0])
+        if candidates is None:
+            return
+        if len(name_parts) == 1:
+            result.extend(candidates)
+            return
+        rest = name_parts[1:]
+        for candidate in candidates:
+            if rest[0] not in candidate._hidden_names:
+                candidate._child._search_into(rest, result)
+
+    def _get_name_index(self) -> Dict[str, List["NamedWrapper"]]:
+        """
+        Results of the search for every single name.
+        The index is built with one traversal and cached until the object or any of its descendants is modified.
+        """
+        # pylint: disable=protected-access
+        if self._name_index is not None:
+            return self._name_index
+
+        index: Dict[str, List[NamedWrapper]] = {}
+        # Every object is visited with the set of names that can no longer be found below it:
+        # names matched by its ancestors and names hidden by them.
+        stack: List[Tuple[ScadObject, FrozenSet[str]]] = [(self, frozenset())]
+        while stack:
+            node, blocked_names = stack.pop()
+            if isinstance(node, NamedWrapper):
+                name = node._object_name
+                if name is not None and name not in blocked_names:
+                    index.setdefault(name, []).append(node)
+                    blocked_names = blocked_names | {name}
+                if node._hidden_names:
+                    blocked_names = blocked_names | node._hidden_names
+                stack.append((node._child, blocked_names))
+                continue
+            # Children are pushed in reverse order to keep results in tree order.
+            children = list(node.iter_children())
+            children.reverse()
+            stack.extend((child, blocked_names) for child in children)
+
+        self._name_index = index
+        return index
+
+    def __getitem__(self, name: str | Sequence[str]) -> "ScadObject":
+        # Paths are converted to tuples, so that lists can be used as paths and as keys of the cache.
+        name_parts = (name,) if isinstance(name, str) else tuple(name)
+        # Found descendants are cached until the object or any of its descendants is modified, like the name index.
+        if self._lookup_cache is None:
+            self._lookup_cache = {}
+        lookup_cache = self._lookup_cache
+        if (found := lookup_cache.get(name_parts)) is not None:
+            return found
+
         children = self.search(name_parts)
         if len(children) == 1:
+            lookup_cache[name_parts] = children[0]
             return children[0]
         if len(children) == 0:
             raise KeyError(str(name))
         raise KeyError(f"Found multiple descendants with the name {name}")
 
-    @abstractmethod
-    def iter_children(self) -> Iterable["ScadObject"]:
+    def iter_children(self) -> Sequence["ScadObject"]:
         """
-        Returns an iterable with all child objects.
+        Returns a sequence with all child objects.
         """
         raise NotImplementedError()
 
-    @abstractmethod
     def to_command(self) -> Module:
         """
         Create SCAD command from the object.
+        The command is cached until the object or any of its descendants is modified,
+        or until formatting of values changes.
+        """
+        return self._converted(0)
+
+    def _converted(self, depth: int) -> Module:
+        """
+        Create SCAD command from the object at the given depth of recursion.
+        """
+        # pylint: disable=protected-access
+        command = self._command_cache
+        if command is not None and self._command_generation == _fmt.format_generation:
+            return command
+        if depth == _MAX_RECURSION_DEPTH:
+            return self._converted_iteratively()
+
+        command = self._command_from([child._converted(depth + 1) for child in self.iter_children()])
+        self._command_cache = command
+        self._command_generation = _fmt.format_generation
+        return command
+
+    def _converted_iteratively(self) -> Module:
+        """
+        Create SCAD command from the object without recursion, for subtrees too deep to be converted recursively.
+        """
+        # pylint: disable=protected-access
+        # The tree is converted with a post-order traversal: an object is visited for the second time
+        # after commands of all its children are built and pushed onto the stack of built commands.
+        built: List[Module] = []
+        stack: List[Tuple[ScadObject, Optional[Sequence[ScadObject]]]] = [(self, None)]
+        while stack:
+            node, children = stack.pop()
+            if children is None:
+                command = node._cached_command()
+                if command is not None:
+                    built.append(command)
+                    continue
+                children = node.iter_children()
+                stack.append((node, children))
+                stack.extend((child, None) for child in reversed(children))
+                continue
+            children_start = len(built) - len(children)
+            command = node._cache_command(node._command_from(built[children_start:]))
+            del built[children_start:]
+            built.append(command)
+        return built[0]
+
+    def _cached_command(self) -> Optional[Module]:
+        """
+        The cached command if it is still valid.
+        """
+        if self._command_generation != _fmt.format_generation:
+            return None
+        return self._command_cache
+
+    def _cache_command(self, command: Module) -> Module:
+        """
+        Store the command in the cache.
+        """
+        self._command_cache = command
+        self._command_generation = _fmt.format_generation
+        return command
+
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        """
+        Create SCAD command from the object given commands of its children in iter_children order.
+        The sequence of children is created for the call, so the command can keep it without copying.
         """
         raise NotImplementedError()
 
+    def _modified(self) -> None:
+        """
+        Invalidate cached commands and name indices of the object and all its ancestors after the object is modified.
+        Caches of other objects are kept.
+        """
+        # pylint: disable=protected-access
+        visited = {id(self)}
+        stack: List[ScadObject] = [self]
+        while stack:
+            node = stack.pop()
+            node._command_cache = None
+            node._name_index = None
+            node._lookup_cache = None
+            if node._parents is None:
+                continue
+            for key, parent_ref in list(node._parents.items()):
+                parent = parent_ref()
+                if parent is None:
+                    # Parents that no longer exist are forgotten.
+                    del node._parents[key]
+                elif key not in visited:
+                    visited.add(key)
+                    stack.append(parent)
+
+    def write_to(self, file: Path) -> None:
+        """
+        Write the object to .scad file.
+        """
+        self.to_command().write_to(file)
+
     def named(self, name: str, hidden_names: Iterable[str] = None) -> "ScadObject":
         """
         A new object with given name.
@@ -65,7 +389,7 @@ class ScadObject(ABC):
         A new object that will be commented in .scad file.
         """
         if dedent:
-            comment = textwrap.dedent(comment).strip("\n")
+            comment = _dedent_comment(comment)
         return CommentedWrapper(self, comment)
 
     def with_hidden_descendants(self, hidden_names: Iterable[str]) -> "ScadObject":
@@ -79,30 +403,47 @@ class ScadObject(ABC):
         A new object of the specified color.
         """
         # TODO: Check values are valid.
-        return SimpleModule(name="color", arguments={"c": color, "alpha": alpha}, children=[self])
+        arguments = {"c": color} if alpha is None else {"c": color, "alpha": alpha}
+        return SimpleModule.unchecked(_COLOR, arguments, (self,))
 
-    def transformed(self, matrix: TransformationMatrix) -> "ScadObject":
+    def transformed(self, matrix: TransformationMatrix | numpy.ndarray) -> "ScadObject":
         """
         A new object with transformation matrix applied.
+        Consecutive multmatrix transformations are merged into one.
         """
+        if isinstance(self, Transformation):
+            merged = self._followed_by(numpy.ascontiguousarray(matrix, dtype=numpy.float64))
+            if merged is not None:
+                return merged
         return Transformation(self, matrix)
 
     def scaled(self, vector: Vector3) -> "ScadObject":
         """
         A new object with scaling applied.
+        Consecutive scalings are merged into one.
         """
+        if isinstance(self, Scaling):
+            return Scaling(self._child, _multiply_vectors(self._vector, vector))
         return Scaling(self, vector)
 
     def rotated(self, angle_deg: Vector3 | float, axis: Vector3 = None) -> "ScadObject":
         """
         A new object with rotation applied.
+        Consecutive rotations around the same axis are merged into one.
         """
+        if isinstance(self, Rotation):
+            merged = self._merged(angle_deg, axis)
+            if merged is not None:
+                return merged
         return Rotation(self, angle_deg, axis)
 
     def translated(self, vector: Vector3) -> "ScadObject":
         """
         A new object with translation applied.
+        Consecutive translations are merged into one.
         """
+        if isinstance(self, Translation):
+            return Translation(self._child, _add_vectors(self._vector, vector))
         return Translation(self, vector)
 
     def mirrored(self, vector: Vector3) -> "ScadObject":
@@ -115,31 +456,31 @@ class ScadObject(ABC):
         """
         A new object with forced CGAL rendering.
         """
-        return SimpleModule(name="render", arguments={"convexity": convexity}, children=[self])
+        return SimpleModule.unchecked(_RENDER, {} if convexity is None else {"convexity": convexity}, (self,))
 
     def background(self) -> "ScadObject":
         """
         A new object that will be treated as a background object by OpenSCAD.
         """
-        return SimpleModule(name="%", arguments={}, children=[self])
+        return SimpleModule.unchecked(_BACKGROUND, {}, (self,))
 
     def debug(self) -> "ScadObject":
         """
         A new object that will be treated as a debug object by OpenSCAD.
         """
-        return SimpleModule(name="#", arguments={}, children=[self])
+        return SimpleModule.unchecked(_DEBUG, {}, (self,))
 
     def root(self) -> "ScadObject":
         """
         A new object that will be treated as a root object by OpenSCAD.
         """
-        return SimpleModule(name="|", arguments={}, children=[self])
+        return SimpleModule.unchecked(_ROOT, {}, (self,))
 
     def disable(self) -> "ScadObject":
         """
         A new object that will be ignored by OpenSCAD.
         """
-        return SimpleModule(name="*", arguments={}, children=[self])
+        return SimpleModule.unchecked(_DISABLE, {}, (self,))
 
 
 class NamedWrapper(ScadObject):
@@ -147,12 +488,19 @@ class NamedWrapper(ScadObject):
     Gives names to objects.
     """
 
+    __slots__ = ("_child", "_object_name", "_hidden_names")
+
     def __init__(self, child: ScadObject, object_name: str = None, hidden_names: Iterable[str] = None) -> None:
         super().__init__()
 
         self._child = child
+        self._attach(child)
         self._object_name = object_name
-        self._hidden_names = {} if hidden_names is None else set(hidden_names)
+        self._hidden_names: FrozenSet[str]
+        if isinstance(hidden_names, frozenset):
+            self._hidden_names = hidden_names
+        else:
+            self._hidden_names = frozenset() if hidden_names is None else frozenset(hidden_names)
 
     @property
     def name(self) -> Optional[str]:
@@ -162,31 +510,19 @@ class NamedWrapper(ScadObject):
         return self._object_name
 
     @property
-    def hidden_names(self) -> Iterable[str]:
+    def hidden_names(self) -> FrozenSet[str]:
         """
         List of names of hidden descendants.
         """
         return self._hidden_names
 
-    def search(self, name_parts: Tuple[str, ...]) -> List["ScadObject"]:
-        if name_parts[0] == self.name:
-            name_parts = name_parts[1:]
-            if len(name_parts) == 0:
-                return [self]
-        if name_parts[0] in self.hidden_names:
-            return []
-        result = []
-        for child in self.iter_children():
-            result.extend(child.search(name_parts))
-        return result
-
-    def iter_children(self) -> Iterable["ScadObject"]:
-        return [self._child]
+    def iter_children(self) -> Sequence["ScadObject"]:
+        return (self._child,)
 
-    def to_command(self) -> Module:
+    def _command_from(self, children: Sequence[Module]) -> Module:
         if self.name is not None:
-            return Commented(self.name, self._child.to_command())
-        return self._child.to_command()
+            return Commented(self.name, children[0])
+        return children[0]
 
 
 class CommentedWrapper(ScadObject):
@@ -194,17 +530,20 @@ class CommentedWrapper(ScadObject):
     Adds comments to objects.
     """
 
+    __slots__ = ("_child", "_comment")
+
     def __init__(self, child: ScadObject, comment: str) -> None:
         super().__init__()
 
         self._child = child
+        self._attach(child)
         self._comment = comment
 
-    def iter_children(self) -> Iterable["ScadObject"]:
-        return [self._child]
+    def iter_children(self) -> Sequence["ScadObject"]:
+        return (self._child,)
 
-    def to_command(self) -> Module:
-        return Commented(self._comment, self._child.to_command())
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        return Commented(self._comment, children[0])
 
 
 class SimpleModule(ScadObject):
@@ -212,21 +551,48 @@ class SimpleModule(ScadObject):
     SCAD object representing a specific SCAD command.
     """
 
+    __slots__ = ("_name", "_arguments", "_children", "_formatted_arguments")
+
     def __init__(self, name: str, arguments: Dict[str, Any], children: Iterable[ScadObject]) -> None:
         super().__init__()
 
-        self._name = name
-        self._arguments = dict(arguments)
-        self._children = list(children)
-
-    def iter_children(self) -> Iterable["ScadObject"]:
+        # Names repeat across the whole tree, interning makes their comparisons cheap.
+        # Argument keys are not interned: they come from string literals, which the compiler interns already.
+        # Unspecified arguments are dropped right away, they are never written to .scad file.
+        self._name = sys.intern(name)
+        self._arguments = {key: value for key, value in arguments.items() if value is not None}
+        self._children = tuple(children)
+        for child in self._children:
+            self._attach(child)
+        # Arguments never change, so they are formatted once, when the command is first built.
+        self._formatted_arguments: Optional[Tuple[int, str]] = None
+
+    @classmethod
+    def unchecked(cls, name: str, arguments: Dict[str, Any], children: Tuple[ScadObject, ...]) -> "SimpleModule":
+        """
+        Create the object from prepared values without copying them.
+        The name must be interned and arguments must not contain None values.
+        """
+        module = cls.__new__(cls)
+        ScadObject.__init__(module)
+        module._name = name
+        module._arguments = arguments
+        module._children = children
+        for child in children:
+            module._attach(child)
+        module._formatted_arguments = None
+        return module
+
+    def iter_children(self) -> Sequence["ScadObject"]:
         return self._children
 
-    def to_command(self) -> Module:
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        self._formatted_arguments = _formatted_arguments(self._formatted_arguments, self._arguments)
         return Command(
             name=self._name,
             arguments=self._arguments,
-            children=[child.to_command() for child in self._children],
+            children=children,
+            formatted_arguments=self._formatted_arguments[1],
         )
 
 
@@ -235,27 +601,72 @@ class Transformation(ScadObject):
     Represents the spatial transformation of a child object.
     """
 
-    def __init__(self, child: ScadObject, matrix: TransformationMatrix) -> None:
+    __slots__ = ("_child", "_matrix", "_command_name", "_arguments", "_formatted_arguments")
+
+    def __init__(
+        self,
+        child: ScadObject,
+        matrix: TransformationMatrix | numpy.ndarray,
+        command_name: str = "multmatrix",
+        arguments: Dict[str, Any] = None,
+    ) -> None:
         super().__init__()
 
         self._child = child
-        self._matrix = matrix
+        self._attach(child)
+        # Matrices are stored as contiguous float arrays, composing them is a single matmul.
+        self._matrix = numpy.ascontiguousarray(matrix, dtype=numpy.float64)
+        self._command_name = command_name
+        self._arguments = {"m": matrix} if arguments is None else arguments
+        # Arguments never change, so they are formatted once, when the command is first built.
+        self._formatted_arguments: Optional[Tuple[int, str]] = None
 
     @property
-    def matrix(self) -> TransformationMatrix:
+    def matrix(self) -> numpy.ndarray:
         """
-        Transformation matrix.
+        Transformation matrix as 4x4 float array.
         """
         return self._matrix
 
-    def iter_children(self) -> Iterable["ScadObject"]:
-        return [self._child]
+    @staticmethod
+    def from_matrix(child: ScadObject, matrix: numpy.ndarray) -> "Transformation":
+        """
+        The simplest transformation with the given matrix.
+        Pure translations and scalings are kept readable in .scad file, other matrices become multmatrix.
+        """
+        # A 4x4 matrix is checked as Python numbers, comparing small numpy arrays is much slower.
+        if matrix.shape == (4, 4):
+            (s_x, a, b, t_x), (c, s_y, d, t_y), (e, f, s_z, t_z), last = matrix.tolist()
+            if last == [0, 0, 0, 1] and a == b == c == d == e == f == 0:
+                if s_x == s_y == s_z == 1:
+                    return Translation(child, (t_x, t_y, t_z))
+                if t_x == t_y == t_z == 0:
+                    return Scaling(child, (s_x, s_y, s_z))
+        return Transformation(child, matrix)
 
-    def to_command(self) -> Module:
+    def _followed_by(self, matrix: numpy.ndarray) -> Optional["Transformation"]:
+        """
+        The transformation followed by another one given by its matrix, merged into one object.
+        None if the transformation is not a multmatrix or either matrix is neither 4x4 nor 3x4.
+        """
+        # Other transformations are kept, so that translate, rotate and the others stay readable in .scad file.
+        if self._command_name != "multmatrix":
+            return None
+        existing, incoming = _affine_matrix(self._matrix), _affine_matrix(matrix)
+        if existing is None or incoming is None:
+            return None
+        return Transformation.from_matrix(self._child, mm4(incoming, existing))
+
+    def iter_children(self) -> Sequence["ScadObject"]:
+        return (self._child,)
+
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        self._formatted_arguments = _formatted_arguments(self._formatted_arguments, self._arguments)
         return Command(
-            name="multmatrix",
-            arguments={"m": self._matrix},
-            children=[self._child.to_command()],
+            name=self._command_name,
+            arguments=self._arguments,
+            children=children,
+            formatted_arguments=self._formatted_arguments[1],
         )
 
 
@@ -264,55 +675,46 @@ class Scaling(Transformation):
     Represents scaling.
     """
 
+    __slots__ = ("_vector",)
+
     def __init__(self, child: ScadObject, vector: Vector3) -> None:
         super().__init__(
             child,
-            matrix=(
-                (vector[0], 0, 0, 0),
-                (0, vector[1], 0, 0),
-                (0, 0, vector[2], 0),
-                (0, 0, 0, 1),
-            ),
+            matrix=_scaling_matrix(vector),
+            command_name="scale",
+            arguments={"v": vector},
         )
 
         self._vector = vector
 
-    def to_command(self) -> Module:
-        return Command(
-            name="scale",
-            arguments={"v": self._vector},
-            children=[self._child.to_command()],
-        )
-
 
 class Rotation(Transformation):
     """
     Represents rotation.
     """
 
-    def __init__(self, child: ScadObject, angle_deg: Vector3 | float, axis: Vector3 = None) -> None:
-        if axis is not None:
-            if isinstance(angle_deg, tuple):
-                raise ValueError("When angle_deg specified as a vector, axis must be None")
-            rotation_matrix = rotations.matrix_from_axis_angle(axis + (angle_deg * pi / 180,))
-        else:
-            if isinstance(angle_deg, tuple):
-                rotation_matrix = rotations.R_id
-                for basis, angle in enumerate(angle_deg):
-                    rotation_matrix = rotations.active_matrix_from_angle(basis, angle * pi / 180) @ rotation_matrix
-        matrix = transformations.transform_from(rotation_matrix, (0, 0, 0))
+    __slots__ = ("_angle_deg", "_axis")
 
-        super().__init__(child, matrix)
+    def __init__(self, child: ScadObject, angle_deg: Vector3 | float, axis: Vector3 = None) -> None:
+        super().__init__(
+            child,
+            _rotation_matrix(angle_deg, axis),
+            command_name="rotate",
+            arguments={"a": angle_deg, "v": axis},
+        )
 
         self._angle_deg = angle_deg
         self._axis = axis
 
-    def to_command(self) -> Module:
-        return Command(
-            name="rotate",
-            arguments={"a": self._angle_deg, "v": self._axis},
-            children=[self._child.to_command()],
-        )
+    def _merged(self, angle_deg: Vector3 | float, axis: Vector3 = None) -> Optional["Rotation"]:
+        """
+        The rotation followed by another one, if both are around the same axis.
+        """
+        if axis is None or self._axis is None or tuple(axis) != tuple(self._axis):
+            return None
+        if not isinstance(angle_deg, numbers.Real) or not isinstance(self._angle_deg, numbers.Real):
+            return None
+        return Rotation(self._child, self._angle_deg + angle_deg, axis)
 
 
 class Translation(Transformation):
@@ -320,40 +722,27 @@ class Translation(Transformation):
     Represents translation.
     """
 
+    __slots__ = ("_vector",)
+
     def __init__(self, child: ScadObject, vector: Vector3) -> None:
-        super().__init__(child, transformations.transform_from(rotations.R_id, vector))
+        super().__init__(
+            child,
+            _translation_matrix(vector),
+            command_name="translate",
+            arguments={"v": vector},
+        )
 
         self._vector = vector
 
-    def to_command(self) -> Module:
-        return Command(
-            name="translate",
-            arguments={"v": self._vector},
-            children=[self._child.to_command()],
-        )
-
 
 class Reflection(Transformation):
     """
     Represents reflection.
     """
 
+    __slots__ = ("_vector",)
+
     def __init__(self, child: ScadObject, vector: Vector3) -> None:
-        # From: https://en.wikipedia.org/wiki/Transformation_matrix#Reflection_2
-        a, b, c = vector  # pylint: disable=invalid-name
-        matrix = (
-            (1 - 2 * a * a, -2 * b * a, -2 * c * a, 0),
-            (-2 * a * b, 1 - 2 * b * b, -2 * c * b, 0),
-            (-2 * a * c, -2 * b * c, 1 - 2 * c * c, 0),
-            (0, 0, 0, 1),
-        )
-        super().__init__(child, matrix)
+        super().__init__(child, _reflection_matrix(vector), command_name="mirror", arguments={"v": vector})
 
         self._vector = vector
-
-    def to_command(self) -> Module:
-        return Command(
-            name="mirror",
-            arguments={"v": self._vector},
-            children=[self._child.to_command()],
-        )
@@ -2,24 +2,46 @@
 The mudule provides functions for combining OpenSCAD primitives.
 """
 
-import itertools
-from typing import Iterable
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 from scad.core import ScadObject
 from scad.scad import Command, Module
 
 
+def _materialize(objects: Optional[Iterable[ScadObject]]) -> List[ScadObject]:
+    """
+    New list of the objects, empty if they are not specified.
+    """
+    return [] if objects is None else list(objects)
+
+
+def _group(name: str, children: Sequence[Module]) -> Module:
+    """
+    Command combining the children, or the only child itself.
+    A group of one child is not written to .scad file anyway.
+    """
+    if len(children) == 1:
+        return children[0]
+    return Command(name=name, arguments={}, children=children, formatted_arguments="")
+
+
 class Minkowski(ScadObject):
     """
     Minkowski sum of shild objects.
     """
 
+    __slots__ = ("_objects",)
+
+    _mutable = True
+
     def __init__(self, objects: Iterable[ScadObject] = None) -> None:
         super().__init__()
 
-        self._objects = list(objects or []) if objects is not None else []
+        self._objects = _materialize(objects)
+        for scad_object in self._objects:
+            self._attach(scad_object)
 
-    def iter_children(self) -> Iterable["ScadObject"]:
+    def iter_children(self) -> Sequence["ScadObject"]:
         return self._objects
 
     def add(self, scad_object) -> "Minkowski":
@@ -27,14 +49,12 @@ class Minkowski(ScadObject):
         Add child object.
         """
         self._objects.append(scad_object)
+        self._attach(scad_object)
+        self._modified()
         return self
 
-    def to_command(self) -> Module:
-        return Command(
-            name="minkowski",
-            arguments={},
-            children=[child.to_command() for child in self._objects],
-        )
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        return Command(name="minkowski", arguments={}, children=children, formatted_arguments="")
 
 
 class Hull(ScadObject):
@@ -42,12 +62,18 @@ class Hull(ScadObject):
     Convex hull of child objects.
     """
 
+    __slots__ = ("_objects",)
+
+    _mutable = True
+
     def __init__(self, objects: Iterable[ScadObject] = None) -> None:
         super().__init__()
 
-        self._objects = list(objects or []) if objects is not None else []
+        self._objects = _materialize(objects)
+        for scad_object in self._objects:
+            self._attach(scad_object)
 
-    def iter_children(self) -> Iterable["ScadObject"]:
+    def iter_children(self) -> Sequence["ScadObject"]:
         return self._objects
 
     def add(self, scad_object) -> "Hull":
@@ -55,14 +81,12 @@ class Hull(ScadObject):
         Add child object.
         """
         self._objects.append(scad_object)
+        self._attach(scad_object)
+        self._modified()
         return self
 
-    def to_command(self) -> Module:
-        return Command(
-            name="hull",
-            arguments={},
-            children=[child.to_command() for child in self._objects],
-        )
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        return Command(name="hull", arguments={}, children=children, formatted_arguments="")
 
 
 class IDUObject(ScadObject):
@@ -81,6 +105,10 @@ class IDUObject(ScadObject):
     Objects are processed regardless of the order in which they were added.
     """
 
+    __slots__ = ("_positive_objects", "_negative_objects", "_intersection_objects", "_all_children")
+
+    _mutable = True
+
     def __init__(
         self,
         positive_objects: Iterable[ScadObject] = None,
@@ -89,18 +117,29 @@ class IDUObject(ScadObject):
     ) -> None:
         super().__init__()
 
-        self._positive_objects = list(positive_objects) if positive_objects is not None else []
-        self._negative_objects = list(negative_objects) if negative_objects is not None else []
-        self._intersection_objects = list(intersection_objects) if intersection_objects is not None else []
+        self._positive_objects = _materialize(positive_objects)
+        self._negative_objects = _materialize(negative_objects)
+        self._intersection_objects = _materialize(intersection_objects)
+        self._all_children: Optional[Tuple[ScadObject, ...]] = None
+        for scad_object in self.iter_children():
+            self._attach(scad_object)
+
+    def iter_children(self) -> Sequence["ScadObject"]:
+        if self._all_children is None:
+            self._all_children = (*self._positive_objects, *self._negative_objects, *self._intersection_objects)
+        return self._all_children
 
-    def iter_children(self) -> Iterable["ScadObject"]:
-        return itertools.chain(self._positive_objects, self._negative_objects, self._intersection_objects)
+    def _modified(self) -> None:
+        self._all_children = None
+        super()._modified()
 
     def add_positive(self, scad_object: ScadObject) -> "IDUObject":
         """
         Add object to union.
         """
         self._positive_objects.append(scad_object)
+        self._attach(scad_object)
+        self._modified()
         return self
 
     def add_negative(self, scad_object: ScadObject) -> "IDUObject":
@@ -109,6 +148,8 @@ class IDUObject(ScadObject):
         It will be subtracted from the union of all positive objects.
         """
         self._negative_objects.append(scad_object)
+        self._attach(scad_object)
+        self._modified()
         return self
 
     def intersect(self, scad_object: ScadObject) -> "IDUObject":
@@ -116,6 +157,8 @@ class IDUObject(ScadObject):
         Add object to intersection.
         """
         self._intersection_objects.append(scad_object)
+        self._attach(scad_object)
+        self._modified()
         return self
 
     def __iadd__(self, scad_object: ScadObject) -> "IDUObject":
@@ -127,15 +170,10 @@ class IDUObject(ScadObject):
     def __imul__(self, scad_object: ScadObject) -> "IDUObject":
         return self.intersect(scad_object)
 
-    def to_command(self) -> Module:
-        union_children = [child.to_command() for child in self._positive_objects]
-        difference_children = [child.to_command() for child in self._negative_objects]
-        intersection_children = [child.to_command() for child in self._intersection_objects]
-
-        union = Command(name="union", arguments={}, children=union_children)
-        difference_children.insert(0, union)
-
-        difference = Command(name="difference", arguments={}, children=difference_children)
-        intersection_children.insert(0, difference)
+    def _command_from(self, children: Sequence[Module]) -> Module:
+        negative_start = len(self._positive_objects)
+        intersection_start = negative_start + len(self._negative_objects)
 
-        return Command(name="intersection", arguments={}, children=intersection_children)
+        union = _group("union", children[:negative_start])
+        difference = _group("difference", (union, *children[negative_start:intersection_start]))
+        return _group("intersection", (difference, *children[intersection_start:]))
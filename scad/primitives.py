@@ -4,6 +4,8 @@ The mudule provides functions for creating OpenSCAD primitives.
 
 from typing import List
 
+import numpy
+
 from scad.core import ScadObject, SimpleModule, Vector3
 
 
@@ -11,14 +13,14 @@ def box(x: float, y: float, z: float, *, center: bool = False) -> ScadObject:
     """
     Creates a box with the specified side lengths.
     """
-    return SimpleModule(name="cube", arguments={"size": (x, y, z), "center": center}, children=[])
+    return SimpleModule.unchecked("cube", {"size": (x, y, z), "center": center}, ())
 
 
 def cube(size: float, *, center: bool = False) -> ScadObject:
     """
     Creates a cube with the specified side length.
     """
-    return SimpleModule(name="cube", arguments={"size": (size, size, size), "center": center}, children=[])
+    return SimpleModule.unchecked("cube", {"size": (size, size, size), "center": center}, ())
 
 
 def sphere(radius: float, *, fa: float = None, fs: float = None, fn: float = None) -> ScadObject:
@@ -51,7 +53,7 @@ def cylinder(
     Creates a cylinder with given parameters.
     """
     return SimpleModule(
-        name="sphere",
+        name="cylinder",
         arguments={
             "h": height,
             "r": r_bottom if r_top is None else None,
@@ -66,9 +68,14 @@ def cylinder(
     )
 
 
-def polyhedron(points: List[Vector3], faces: List[List[int]], convexity: int = 1) -> ScadObject:
+def polyhedron(
+    points: List[Vector3] | numpy.ndarray,
+    faces: List[List[int]] | numpy.ndarray,
+    convexity: int = 1,
+) -> ScadObject:
     """
     Creates a polyhedron.
+    Large meshes are best passed as numpy arrays of shape (N, 3), they are formatted without per-point Python calls.
     """
     return SimpleModule(
         name="polyhedron",
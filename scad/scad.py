@@ -2,59 +2,39 @@
 The module provides tools for creating .scad files.
 """
 
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+import io
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
-
-
-def format_value(value: Any) -> str:
-    """
-    Convert Python object to OpenSCAD representation.
-    """
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    if isinstance(value, (int, float)):
-        return str(value)
-    if isinstance(value, (list, tuple)):
-        return f"[{', '.join(str(item) for item in value)}]"
-    if isinstance(value, str):
-        # TODO: Excape string.
-        return f'"{value}"'
-
-    raise ValueError("Unsupported type")
-
-
-def format_argument(name: str, value: Any) -> str:
-    """
-    Format named argument.
-    """
-    return f"{name}={format_value(value)}"
-
-
-def format_command_arguments(arguments: Dict[str, Any]) -> str:
-    """
-    Format command arguments.
-    """
-    return ", ".join(format_argument(name, value) for name, value in arguments.items() if value is not None)
-
-
-def indent(indentation: int, line: str) -> str:
-    """
-    Add indentation to the line.
-    """
-    return " " * indentation + line
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from scad._fmt import (  # pylint: disable=unused-import
+    format_argument,
+    format_array,
+    format_bool,
+    format_command_arguments,
+    format_sequence,
+    format_string,
+    format_value,
+    indent,
+    register_formatter,
+    sequence_types,
+    set_float_precision,
+    value_formatters,
+)
 
 
-debug_commands = set("%#|*")
+# The sets are frozen: command_flags below is computed from them once, on import.
+debug_commands = frozenset("%#|*")
 
-commands_to_skip_if_less_than_two_children = {
-    "union",
-    "difference",
-    "intersection",
-    "minkowski",
-    "hull",
-}
+commands_to_skip_if_less_than_two_children = frozenset(
+    {
+        "union",
+        "difference",
+        "intersection",
+        "minkowski",
+        "hull",
+    }
+)
 
 commands_to_skip_if_no_children = (
     commands_to_skip_if_less_than_two_children
@@ -64,27 +44,83 @@ commands_to_skip_if_no_children = (
     }
 )
 
+# Membership in the sets above as bit flags, looked up once per command.
+SKIP_IF_NO_CHILDREN = 1
+SKIP_IF_LESS_THAN_TWO_CHILDREN = 2
+DEBUG_COMMAND = 4
+
+command_flags = {
+    name: (
+        (SKIP_IF_NO_CHILDREN if name in commands_to_skip_if_no_children else 0)
+        | (SKIP_IF_LESS_THAN_TWO_CHILDREN if name in commands_to_skip_if_less_than_two_children else 0)
+        | (DEBUG_COMMAND if name in debug_commands else 0)
+    )
+    for name in commands_to_skip_if_no_children
+}
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Text of blocks by their identity and indentation, None for blocks written only once so far.
+RenderedBlocks = Dict[Tuple[int, int], Optional[str]]
 
-class Module(ABC):
+
+class Module:
     """
     OpenSCAD base class.
     """
 
-    @abstractmethod
+    __slots__ = ()
+
+    def is_empty(self) -> bool:
+        """
+        Check whether the object produces no OpenSCAD code.
+        """
+        raise NotImplementedError()
+
+    def write(self, out: TextIO, indentation: int = 0, rendered: RenderedBlocks = None) -> None:
+        """
+        Write OpenSCAD representation of the object to the text stream.
+        Every line is terminated with a newline character.
+        Blocks shared by several parents are rendered once and then reused.
+        """
+        if rendered is None:
+            rendered = {}
+        # Chains of single-child modules are written in a loop instead of recursion.
+        module: Optional[Module] = self
+        while module is not None:
+            module = module.write_until_tail(out, indentation, rendered)
+
+    def write_until_tail(self, out: TextIO, indentation: int, rendered: RenderedBlocks) -> Optional["Module"]:
+        """
+        Write OpenSCAD representation of the object except the trailing child written with the same indentation.
+        Returns that child, if any.
+        """
+        raise NotImplementedError()
+
     def to_scad(self) -> List[str]:
         """
         Convert the object to OpenSCAD representation.
         """
-        raise NotImplementedError()
+        return self.to_scad_str().splitlines()
+
+    def to_scad_str(self, indentation: int = 0) -> str:
+        """
+        Convert the object to OpenSCAD representation as a single string.
+        Every line is indented and terminated with a newline character.
+        """
+        buffer = io.StringIO()
+        self.write(buffer, indentation)
+        return buffer.getvalue()
 
     def write_to(self, file: Path) -> None:
         """
         Write the object ot .scad file.
         """
-        file.write_text("\n".join(self.to_scad()))
+        with file.open("w", buffering=WRITE_BUFFER_SIZE) as out:
+            self.write(out)
 
 
-@dataclass
+@dataclass(slots=True)
 class Command(Module):
     """
     OpenSCAD command.
@@ -93,37 +129,60 @@ class Command(Module):
     name: str
     arguments: Dict[str, Any]
     children: Sequence[Module]
+    formatted_arguments: Optional[str] = None
+    flags: int = field(init=False, repr=False, compare=False)
 
-    def to_scad(self) -> List[str]:
-        """
-        Convert the object to OpenSCAD representation.
-        """
-        if self.name in debug_commands:
-            header = self.name
-        else:
-            header = f"{self.name}({format_command_arguments(self.arguments)})"
+    def __post_init__(self) -> None:
+        self.flags = command_flags.get(self.name, 0)
 
+    def is_empty(self) -> bool:
         if len(self.children) == 0:
-            if self.name in commands_to_skip_if_no_children:
-                lines = []
-            else:
-                lines = [header + ";"]
-        elif len(self.children) == 1:
-            if self.name in commands_to_skip_if_less_than_two_children:
-                lines = []
-            else:
-                lines = [header]
-            lines.extend(self.children[0].to_scad())
-        else:
-            lines = [header + " {"]
-            for child in self.children:
-                lines.extend(indent(4, line) for line in child.to_scad())
-            lines.append("}")
-
-        return lines
+            return bool(self.flags & SKIP_IF_NO_CHILDREN)
+        if len(self.children) == 1 and self.flags & SKIP_IF_LESS_THAN_TWO_CHILDREN:
+            return self.children[0].is_empty()
+        return False
 
+    def write_until_tail(self, out: TextIO, indentation: int, rendered: RenderedBlocks) -> Optional[Module]:
+        if self.flags & DEBUG_COMMAND:
+            header = self.name
+        else:
+            arguments = self.formatted_arguments
+            if arguments is None:
+                arguments = format_command_arguments(self.arguments)
+            header = f"{self.name}({arguments})"
 
-@dataclass
+        pad = " " * indentation
+        if len(self.children) == 0:
+            if not self.flags & SKIP_IF_NO_CHILDREN:
+                out.write(f"{pad}{header};\n")
+            return None
+        if len(self.children) == 1:
+            if not self.flags & SKIP_IF_LESS_THAN_TWO_CHILDREN:
+                out.write(f"{pad}{header}\n")
+            return self.children[0]
+
+        # A block is written directly the first time, captured the second time and reused afterwards.
+        key = (id(self), indentation)
+        if key not in rendered:
+            rendered[key] = None
+            self._write_block(out, pad, header, indentation, rendered)
+            return None
+        text = rendered[key]
+        if text is None:
+            buffer = io.StringIO()
+            self._write_block(buffer, pad, header, indentation, rendered)
+            text = rendered[key] = buffer.getvalue()
+        out.write(text)
+        return None
+
+    def _write_block(self, out: TextIO, pad: str, header: str, indentation: int, rendered: RenderedBlocks) -> None:
+        out.write(f"{pad}{header} {{\n")
+        for child in self.children:
+            child.write(out, indentation + 4, rendered)
+        out.write(f"{pad}}}\n")
+
+
+@dataclass(slots=True)
 class Commented(Module):
     """
     OpenSCAD module with comment.
@@ -132,9 +191,12 @@ class Commented(Module):
     comment: str
     child: Module
 
-    def to_scad(self) -> List[str]:
-        child_lines = self.child.to_scad()
-        if not child_lines:
-            return []
-        comment_lines = self.comment.splitlines()
-        return [f"// {line}" for line in comment_lines] + child_lines
+    def is_empty(self) -> bool:
+        return self.child.is_empty()
+
+    def write_until_tail(self, out: TextIO, indentation: int, rendered: RenderedBlocks) -> Optional[Module]:
+        if self.child.is_empty():
+            return None
+        pad = " " * indentation
+        out.write("".join(f"{pad}// {line}\n" for line in self.comment.splitlines()))
+        return self.child
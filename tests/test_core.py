@@ -0,0 +1,102 @@
+import numpy
+import pytest
+
+from scad.core import euler_rotation_matrices
+from scad.operators import Hull, IDUObject
+from scad.primitives import box
+from scad.scad import set_float_precision
+
+MATRIX_3X4 = ((1, 0, 0, 5), (0, 1, 0, 0), (0, 0, 1, 0))
+
+
+def test_transformed_3x4_twice():
+    result = box(1, 1, 1).transformed(MATRIX_3X4).transformed(MATRIX_3X4)
+    assert result.to_command().to_scad() == ["translate(v=[10.0, 0.0, 0.0])", "cube(size=[1, 1, 1], center=false);"]
+
+
+def test_transformed_4x4_then_3x4():
+    matrix_4x4 = ((1, 0, 0, 1), (0, 1, 0, 2), (0, 0, 1, 3), (0, 0, 0, 1))
+    result = box(1, 1, 1).transformed(matrix_4x4).transformed(MATRIX_3X4)
+    assert result.to_command().to_scad() == ["translate(v=[6.0, 2.0, 3.0])", "cube(size=[1, 1, 1], center=false);"]
+
+
+def test_merged_transformations_compose_in_application_order():
+    cube = box(1, 1, 1)
+    first, second = cube.rotated((10, 20, 30)).matrix, cube.rotated((40, 50, 60)).matrix
+    result = cube.transformed(first).transformed(second)
+    assert numpy.allclose(result.matrix, second @ first)
+
+
+def test_rotation_then_translation_stays_readable():
+    result = box(1, 1, 1).rotated((0, 0, 90)).translated((1, 2, 3))
+    assert result.to_command().to_scad() == [
+        "translate(v=[1, 2, 3])",
+        "rotate(a=[0, 0, 90])",
+        "cube(size=[1, 1, 1], center=false);",
+    ]
+
+
+def test_floats_are_written_exactly_by_default():
+    assert box(1234567.5, 12345.678, 1).to_command().to_scad() == ["cube(size=[1234567.5, 12345.678, 1], center=false);"]
+
+
+def test_float_precision_applies_to_built_objects():
+    translated = box(1, 1, 1).translated((0.123456789, 0, 0))
+    union = IDUObject([translated, box(2, 2, 2)])
+    try:
+        assert union.to_command().to_scad()[1] == "    translate(v=[0.123456789, 0, 0])"
+        set_float_precision(3)
+        assert union.to_command().to_scad()[1] == "    translate(v=[0.123, 0, 0])"
+        set_float_precision(7)
+        assert translated.to_command().to_scad()[0] == "translate(v=[0.1234568, 0, 0])"
+    finally:
+        set_float_precision(None)
+
+
+def test_objects_are_not_iterable():
+    with pytest.raises(TypeError, match="not iterable"):
+        iter(box(1, 1, 1))
+
+
+def test_lookup_by_list_path():
+    part = box(1, 1, 1).named("part")
+    model = IDUObject([IDUObject([part]).named("group")])
+    assert model[["group", "part"]] is part
+    assert model[("group", "part")] is part
+
+
+def test_rotation_by_list_of_angles():
+    cube = box(1, 1, 1)
+    assert numpy.array_equal(cube.rotated([10, 20, 30]).matrix, cube.rotated((10, 20, 30)).matrix)
+    assert cube.rotated([0, 0, 90]).to_command().to_scad()[0] == "rotate(a=[0, 0, 90])"
+
+
+def test_modification_invalidates_only_ancestors():
+    first, second = Hull([box(1, 1, 1)]), Hull([box(2, 2, 2)])
+    first_model = first.colored("red").named("first")
+    second_model = second.colored("blue").named("second")
+    first_command, second_command = first_model.to_command(), second_model.to_command()
+    assert first_model["first"] is first_model
+
+    first.add(box(3, 3, 3))
+    assert second_model.to_command() is second_command
+    assert first_model.to_command() is not first_command
+    assert first_model.to_command().to_scad()[-2:] == ["    cube(size=[3, 3, 3], center=false);", "}"]
+
+
+def test_modification_invalidates_name_lookups_of_ancestors():
+    group = IDUObject()
+    model = IDUObject([group.named("group")])
+    with pytest.raises(KeyError):
+        model["part"]  # pylint: disable=pointless-statement
+    part = box(1, 1, 1).named("part")
+    group += part
+    assert model["part"] is part
+
+
+def test_euler_rotation_matrices_match_rotated():
+    angles = [(0, 0, 0), (10, 20, 30), (90, 0, 0), (-45, 135, 270)]
+    matrices = euler_rotation_matrices(numpy.array(angles))
+    assert matrices.shape == (len(angles), 4, 4)
+    for angle, matrix in zip(angles, matrices):
+        assert numpy.allclose(matrix, box(1, 1, 1).rotated(angle).matrix)
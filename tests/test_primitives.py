@@ -0,0 +1,5 @@
+from scad.primitives import cylinder
+
+
+def test_cylinder_command_name():
+    assert cylinder(1, 2).to_command().name == "cylinder"
@@ -0,0 +1,18 @@
+import numpy
+
+from scad.scad import format_value, register_formatter, value_formatters
+
+
+def test_registered_number_formatters_apply_to_vectors():
+    default_float, default_int = value_formatters[float], value_formatters[int]
+    try:
+        register_formatter(float, lambda value: f"{value:.1f}")
+        register_formatter(int, lambda value: f"{value}.0")
+        assert format_value([0.25, 1.5, 2.0]) == "[0.2, 1.5, 2.0]"
+        assert format_value((1, 2, 3, 4)) == "[1.0, 2.0, 3.0, 4.0]"
+        assert format_value([[1, 2], [3, 4]]) == "[[1.0, 2.0], [3.0, 4.0]]"
+        assert format_value(numpy.array([[0.5, 1.0]])) == "[[0.5, 1.0]]"
+    finally:
+        register_formatter(float, default_float)
+        register_formatter(int, default_int)
+    assert format_value([0.25, 1.5, 2.0]) == "[0.25, 1.5, 2.0]"